@@ -10,7 +10,6 @@ import time
 import signal
 import asyncio
 import logging
-import contextlib
 from asyncio.subprocess import Process
 from libkirk.sut import SUT
 from libkirk.sut import IOBuffer
@@ -52,16 +51,12 @@ class HostSUT(SUT):
         return self._running
 
     @staticmethod
-    async def _process_alive(proc: Process) -> bool:
+    def _process_alive(proc: Process) -> bool:
         """
-        Return True if process is alive and running.
+        Return True if process is alive and running. The return code is set
+        by the event loop child watcher, so process status is not polled.
         """
-        with contextlib.suppress(asyncio.TimeoutError):
-            returncode = await asyncio.wait_for(proc.wait(), 1e-6)
-            if returncode is not None:
-                return False
-
-        return True
+        return proc.returncode is None
 
     async def _kill_process(self, proc: Process) -> None:
         """
@@ -120,6 +115,7 @@ class HostSUT(SUT):
         finally:
             self._stop = False
             self._running = False
+            self._info = None
             self._logger.info("SUT has stopped")
 
     async def run_command(
@@ -171,7 +167,9 @@ class HostSUT(SUT):
                 stdout += sline
                 panic = "Kernel panic" in stdout[-2*self.BUFFSIZE:]
 
-                if not await self._process_alive(proc):
+                # stop reading when stdout reached EOF as well, otherwise
+                # we would spin until the child watcher has seen the exit
+                if not line or not self._process_alive(proc):
                     break
 
             await proc.wait()
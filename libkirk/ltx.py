@@ -471,6 +471,7 @@ class LTX:
         self._task = None
         self._messages = []
         self._exception = None
+        self._waiters = set()
 
     async def __aenter__(self) -> None:
         """
@@ -564,23 +565,31 @@ class LTX:
         """
         req_len = len(requests)
         replies = {}
+        completed = asyncio.Event()
 
         async def on_complete(req, *args):
             replies[req] = args
+            if len(replies) == req_len:
+                completed.set()
 
         for req in requests:
             req.add_done_coro(on_complete)
 
-        await self.send(requests)
-
-        while len(replies) != req_len:
-            await asyncio.sleep(0.005)
-            if self._exception:
-                raise self._exception
+        # the polling task also sets the event when it stops, so we don't
+        # wait forever if an error occurs before all replies arrived
+        self._waiters.add(completed)
+        try:
+            await self.send(requests)
+            await completed.wait()
+        finally:
+            self._waiters.discard(completed)
 
         if self._exception:
             raise self._exception
 
+        if len(replies) != req_len:
+            raise LTXError("LTX has been disconnected")
+
         return replies
 
     async def _read(self, size: int) -> bytes:
@@ -649,6 +658,9 @@ class LTX:
         except LTXError as err:
             self._exception = err
         finally:
+            for waiter in self._waiters:
+                waiter.set()
+
             self._logger.info("Producer has stopped")
 
     async def _feed_requests(self, data: list) -> None:
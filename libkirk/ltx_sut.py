@@ -93,6 +93,8 @@ class LTXSUT(SUT):
             await self._ltx.disconnect()
         except LTXError as err:
             raise SUTError(err)
+        finally:
+            self._info = None
 
         while await self.is_running:
             await asyncio.sleep(1e-2)
@@ -9,6 +9,7 @@ import os
 import re
 import asyncio
 import argparse
+import importlib
 import libkirk
 import libkirk.sut
 import libkirk.data
@@ -477,5 +478,17 @@ def run(cmd_args: list = None) -> None:
     _start_session(args, parser)
 
 
-if __name__ == "__main__":
+def main() -> None:
+    """
+    Entry point of the kirk command. No event loop exists at this point,
+    so kirk creates its own one, using uvloop when it's available.
+    """
+    if importlib.util.find_spec("uvloop"):
+        asyncio.set_event_loop(
+            importlib.import_module("uvloop").new_event_loop())
+
     run()
+
+
+if __name__ == "__main__":
+    main()
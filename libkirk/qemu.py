@@ -398,6 +398,7 @@ class QemuSUT(SUT):
                 await self._proc.wait()
 
             self._stop = False
+            self._info = None
 
         self._logger.info("Qemu process ended")
 
@@ -5,9 +5,13 @@
 
 .. moduleauthor:: Andrea Cervesato <andrea.cervesato@suse.com>
 """
+import re
 import time
+import shlex
+import codecs
 import asyncio
 import logging
+import functools
 import importlib
 import contextlib
 from libkirk.sut import SUT
@@ -26,8 +30,10 @@ try:
         """
 
         def __init__(self, iobuffer: IOBuffer):
-            self._output = []
+            self._output = bytearray()
             self._iobuffer = iobuffer
+            self._decoder = codecs.getincrementaldecoder("utf-8")(
+                errors="replace")
             self._panic = False
 
         def data_received(self, data, _) -> None:
@@ -35,12 +41,18 @@ try:
             Override default data_received callback, storing stdout/stderr inside
             a buffer and checking for kernel panic.
             """
-            self._output.append(data)
+            start = max(len(self._output) - len(PANIC_MSG) + 1, 0)
+            self._output.extend(data)
 
             if self._iobuffer:
-                asyncio.ensure_future(self._iobuffer.write(data))
-
-            if "Kernel panic" in data:
+                # incremental decoder handles characters which are split
+                # between two consecutive chunks
+                asyncio.ensure_future(
+                    self._iobuffer.write(self._decoder.decode(data)))
+
+            # search also inside the tail of the previous chunk, in case
+            # message has been split between two chunks
+            if not self._panic and self._output.find(PANIC_MSG, start) != -1:
                 self._panic = True
 
         def kernel_panic(self) -> bool:
@@ -49,20 +61,26 @@ try:
             """
             return self._panic
 
-        def get_output(self) -> list:
+        def get_output(self) -> str:
             """
-            Return the list containing stored stdout/stderr messages.
+            Return the stored stdout/stderr messages.
             """
-            return self._output
+            return self._output.decode(encoding="utf-8", errors="replace")
 except ModuleNotFoundError:
     pass
 
 
+MAX_SESSIONS_RE = re.compile(rb'^\s*MaxSessions\s+(\d+)', re.MULTILINE)
+
+PANIC_MSG = b"Kernel panic"
+
+
 # pylint: disable=too-many-instance-attributes
 class SSHSUT(SUT):
     """
     A SUT that is using SSH protocol con communicate and transfer data.
     """
+    BUFFSIZE = 64 * 1024
 
     def __init__(self) -> None:
         self._logger = logging.getLogger("kirk.ssh")
@@ -74,11 +92,13 @@ class SSHSUT(SUT):
         self._password = None
         self._key_file = None
         self._sudo = False
+        self._keepalive = 0
+        self._compression = False
         self._session_sem = None
         self._stop = False
         self._conn = None
         self._downloader = None
-        self._channels = []
+        self._channels = set()
 
     @property
     def name(self) -> str:
@@ -94,6 +114,10 @@ class SSHSUT(SUT):
             "key_file": "private key location",
             "reset_cmd": "command to reset the remote SUT",
             "sudo": "use sudo to access to root shell (default: 0)",
+            "keepalive_interval": "seconds between keepalive messages. "
+                                  "0 disables keepalive (default: 0)",
+            "compression": "use zlib compression (default: 0 for "
+                           "localhost, 1 otherwise)",
         }
 
     async def _reset(self, iobuffer: IOBuffer = None) -> None:
@@ -111,7 +135,7 @@ class SSHSUT(SUT):
             stderr=asyncio.subprocess.PIPE)
 
         while True:
-            line = await proc.stdout.read(1024)
+            line = await proc.stdout.read(self.BUFFSIZE)
             if line:
                 sline = line.decode(encoding="utf-8", errors="ignore")
 
@@ -123,28 +147,52 @@ class SSHSUT(SUT):
                 if returncode is not None:
                     break
 
-        await proc.wait()
+        # process might exit before we read all its output
+        remaining = await proc.stdout.read()
+        if remaining and iobuffer:
+            await iobuffer.write(
+                remaining.decode(encoding="utf-8", errors="ignore"))
 
         self._logger.info("Reset command has been executed")
 
-    def _create_command(self, cmd: str, cwd: str, env: dict) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _command_prefix(cwd: str, env: tuple) -> str:
         """
-        Create command to send to SSH client.
+        Create the shell prefix moving into ``cwd`` and exporting ``env``
+        items. Tests usually share the same cwd and env, so the prefix is
+        cached and not rebuilt for each command.
         """
         args = []
 
         if cwd:
-            args.append(f"cd {cwd} && ")
+            args.append(f"cd {shlex.quote(cwd)} && ")
 
         if env:
-            for key, value in env.items():
-                args.append(f"export {key}={value} && ")
+            exports = ' '.join(
+                f"{key}={shlex.quote(value)}"
+                for key, value in env)
+
+            args.append(f"export {exports} && ")
 
-        args.append(cmd)
+        return ''.join(args)
+
+    def _create_command(self, cmd: str, cwd: str, env: dict) -> str:
+        """
+        Create command to send to SSH client.
+        """
+        if not cwd and not env and not self._sudo:
+            return cmd
+
+        # values are converted first, so the key is always hashable
+        env_items = None
+        if env:
+            env_items = tuple((key, str(value)) for key, value in env.items())
+
+        script = self._command_prefix(cwd, env_items) + cmd
 
-        script = ''.join(args)
         if self._sudo:
-            script = f"sudo /bin/sh -c '{script}'"
+            script = f"sudo /bin/sh -c {shlex.quote(script)}"
 
         return script
 
@@ -165,7 +213,7 @@ class SSHSUT(SUT):
         try:
             self._port = int(kwargs.get("port", "22"))
 
-            if 1 > self._port > 65535:
+            if not 1 <= self._port <= 65535:
                 raise ValueError()
         except ValueError:
             raise SUTError("'port' must be an integer between 1-65535")
@@ -175,6 +223,25 @@ class SSHSUT(SUT):
         except ValueError:
             raise SUTError("'sudo' must be 0 or 1")
 
+        try:
+            self._keepalive = int(kwargs.get("keepalive_interval", 0))
+
+            if self._keepalive < 0:
+                raise ValueError()
+        except ValueError:
+            raise SUTError("'keepalive_interval' must be a positive integer")
+
+        # compression only costs CPU time when we are not using network
+        compression = 1
+        if self._host in ("localhost", "127.0.0.1", "::1"):
+            compression = 0
+
+        try:
+            self._compression = int(
+                kwargs.get("compression", compression)) == 1
+        except ValueError:
+            raise SUTError("'compression' must be 0 or 1")
+
     @property
     def parallel_execution(self) -> bool:
         return True
@@ -189,31 +256,55 @@ class SSHSUT(SUT):
 
         try:
             self._conn = None
+
+            kwargs = {
+                "host": self._host,
+                "port": self._port,
+                "username": self._user,
+                "keepalive_interval": self._keepalive,
+                "compression_algs": None,
+            }
+
+            if self._compression:
+                kwargs["compression_algs"] = ["zlib@openssh.com", "none"]
+
             if self._key_file:
                 priv_key = asyncssh.read_private_key(self._key_file)
-
-                self._conn = await asyncssh.connect(
-                    host=self._host,
-                    port=self._port,
-                    username=self._user,
-                    client_keys=[priv_key])
+                kwargs["client_keys"] = [priv_key]
             else:
-                self._conn = await asyncssh.connect(
-                    host=self._host,
-                    port=self._port,
-                    username=self._user,
-                    password=self._password)
+                kwargs["password"] = self._password
+
+            self._conn = await asyncssh.connect(**kwargs)
+
+            # SFTP client is started only here, so concurrent fetch_file()
+            # calls can't start more than one. Some SSH servers (i.e.
+            # dropbear) don't provide the SFTP subsystem, so files are read
+            # with cat
+            try:
+                self._downloader = await self._conn.start_sftp_client()
+            except asyncssh.Error as err:
+                self._logger.info("SFTP is not available: %s", err)
 
             # read maximum number of sessions and limit `run_command`
-            # concurrent calls to that by using a semaphore
-            ret = await self._conn.run(
-                r'sed -n "s/^MaxSessions\s*\([[:digit:]]*\)/\1/p" '
-                '/etc/ssh/sshd_config')
+            # concurrent calls to that by using a semaphore. If the
+            # configuration can't be read, we fall back to the sshd default
+            max_sessions = 10
 
-            max_sessions = ret.stdout or 10
+            if self._downloader:
+                try:
+                    async with self._downloader.open(
+                            '/etc/ssh/sshd_config', 'rb') as fconf:
+                        match = MAX_SESSIONS_RE.search(await fconf.read())
+                        if match:
+                            max_sessions = int(match.group(1))
+                except asyncssh.Error as err:
+                    self._logger.info("Can't read SSH configuration: %s", err)
+
+                max_sessions -= 1
 
             self._logger.info("Maximum SSH sessions: %d", max_sessions)
-            self._session_sem = asyncio.Semaphore(max_sessions)
+
+            self._session_sem = asyncio.Semaphore(max(max_sessions, 1))
         except asyncssh.misc.ChannelOpenError as err:
             if not self._stop:
                 raise SUTError(err)
@@ -227,14 +318,15 @@ class SSHSUT(SUT):
             if self._channels:
                 self._logger.info("Killing %d process(es)", len(self._channels))
 
-                for proc in self._channels:
+                for proc in list(self._channels):
                     proc.kill()
                     await proc.wait_closed()
 
                 self._channels.clear()
 
             if self._downloader:
-                await self._downloader.close()
+                self._downloader.exit()
+                await self._downloader.wait_closed()
 
             self._logger.info("Closing connection")
             self._conn.close()
@@ -244,13 +336,15 @@ class SSHSUT(SUT):
             await self._reset(iobuffer=iobuffer)
         finally:
             self._stop = False
+            self._downloader = None
             self._conn = None
+            self._info = None
 
     async def ping(self) -> float:
         if not await self.is_running:
             raise SUTError("SUT is not running")
 
-        start_t = time.time()
+        start_t = time.monotonic()
 
         self._logger.info("Ping %s:%d", self._host, self._port)
 
@@ -259,7 +353,7 @@ class SSHSUT(SUT):
         except asyncssh.Error as err:
             raise SUTError(err)
 
-        end_t = time.time() - start_t
+        end_t = time.monotonic() - start_t
 
         self._logger.info("SUT replied after %.3f seconds", end_t)
 
@@ -277,25 +371,28 @@ class SSHSUT(SUT):
         if not await self.is_running:
             raise SUTError("SSH connection is not present")
 
-        async with self._session_sem:
-            cmd = self._create_command(command, cwd, env)
-            ret = None
-            start_t = 0
-            stdout = []
-            panic = False
-            channel = None
-            session = None
+        cmd = self._create_command(command, cwd, env)
+        ret = None
+        start_t = 0
+        stdout = ""
+        panic = False
+        channel = None
+        session = None
 
+        # session slot is kept busy only while channel is open, so waiting
+        # commands can start as soon as possible
+        async with self._session_sem:
             try:
                 self._logger.info("Running command: %s", repr(command))
 
                 channel, session = await self._conn.create_session(
                     lambda: MySSHClientSession(iobuffer),
-                    cmd
+                    cmd,
+                    encoding=None
                 )
 
-                self._channels.append(channel)
-                start_t = time.time()
+                self._channels.add(channel)
+                start_t = time.monotonic()
 
                 await channel.wait_closed()
 
@@ -303,22 +400,22 @@ class SSHSUT(SUT):
                 stdout = session.get_output()
             finally:
                 if channel:
-                    self._channels.remove(channel)
+                    self._channels.discard(channel)
 
                     ret = {
                         "command": command,
                         "returncode": channel.get_returncode(),
-                        "exec_time": time.time() - start_t,
-                        "stdout": "".join(stdout)
+                        "exec_time": time.monotonic() - start_t,
+                        "stdout": stdout
                     }
 
-            if panic:
-                raise KernelPanicError()
+        if panic:
+            raise KernelPanicError()
 
-            self._logger.info("Command executed")
-            self._logger.debug(ret)
+        self._logger.info("Command executed")
+        self._logger.debug(ret)
 
-            return ret
+        return ret
 
     async def fetch_file(self, target_path: str) -> bytes:
         if not target_path:
@@ -329,12 +426,16 @@ class SSHSUT(SUT):
 
         data = None
         try:
-            ret = await self._conn.run(
-                f"cat {target_path}",
-                check=True,
-                encoding=None)
+            if self._downloader:
+                async with self._downloader.open(target_path, 'rb') as ftarget:
+                    data = await ftarget.read()
+            else:
+                ret = await self._conn.run(
+                    f"cat {shlex.quote(target_path)}",
+                    check=True,
+                    encoding=None)
 
-            data = ret.stdout
+                data = ret.stdout
         except asyncssh.Error as err:
             if not self._stop:
                 raise SUTError(err)
@@ -7,6 +7,7 @@
 """
 import re
 import asyncio
+import libkirk
 from libkirk import KirkException
 from libkirk.plugin import Plugin
 
@@ -35,7 +36,30 @@ class IOBuffer:
         raise NotImplementedError()
 
 
-TAINTED_MSG = [
+INFO_KEYS = ("distro", "distro_ver", "kernel", "arch", "cpu", "ram", "swap")
+
+INFO_SEP = "__kirk_info__"
+
+# serial lines might terminate with CRLF
+INFO_SEP_RE = re.compile(f"\r?\n{INFO_SEP}(\\d+)\r?\n")
+
+INFO_COMMANDS = (
+    ". /etc/os-release && echo \"$ID\"",
+    ". /etc/os-release && echo \"$VERSION_ID\"",
+    "uname -s -r -v",
+    "uname -m",
+    "uname -p",
+    "grep -E '^(MemTotal|SwapTotal):' /proc/meminfo",
+)
+
+# information is read with a single command, so we don't need a SUT
+# round-trip for each one of them. Every output is followed by the return
+# code of the command which generated it
+INFO_SCRIPT = "; ".join(
+    f"({cmd}) 2>/dev/null; printf '\\n{INFO_SEP}%d\\n' $?"
+    for cmd in INFO_COMMANDS)
+
+TAINTED_MSG = (
     "proprietary module was loaded",
     "module was force loaded",
     "kernel running on an out of specification system",
@@ -54,7 +78,31 @@ TAINTED_MSG = [
     "kernel has been live patched",
     "auxiliary taint, defined for and used by distros",
     "kernel was built with the struct randomization plugin"
-]
+)
+
+# tainted bit masks associated with their message
+TAINTED_BITS = tuple((1 << i, msg) for i, msg in enumerate(TAINTED_MSG))
+
+
+def _parse_info(stdout: str) -> list:
+    """
+    Parse the output of ``INFO_SCRIPT``.
+    :param stdout: output of the script
+    :type stdout: str
+    :returns: list of the commands outputs, with "unknown" for the commands
+        which failed
+    """
+    values = ["unknown"] * len(INFO_COMMANDS)
+
+    # split() returns stdout/returncode couples, followed by what comes
+    # after the last separator
+    chunks = INFO_SEP_RE.split(stdout)
+
+    for i, (output, retcode) in enumerate(zip(chunks[0:-1:2], chunks[1::2])):
+        if retcode == "0":
+            values[i] = output.rstrip()
+
+    return values
 
 
 class SUT(Plugin):
@@ -164,6 +212,9 @@ class SUT(Plugin):
 
                 await self.stop(iobuffer=iobuffer)
 
+    # SUT information cache, which is cleared when SUT stops
+    _info = None
+
     async def get_info(self) -> dict:
         """
         Return SUT information.
@@ -180,46 +231,32 @@ class SUT(Plugin):
             }
 
         """
-        # create suite results
-        async def _run_cmd(cmd: str) -> str:
-            """
-            Run command, check for returncode and return command's stdout.
-            """
-            stdout = "unknown"
-            try:
-                ret = await asyncio.wait_for(self.run_command(cmd), 1.5)
-                if ret["returncode"] == 0:
-                    stdout = ret["stdout"].rstrip()
-            except asyncio.TimeoutError:
-                pass
-
-            return stdout
-
-        distro, \
-            distro_ver, \
-            kernel, \
-            arch, \
-            cpu, \
-            meminfo = await asyncio.gather(*[
-                _run_cmd(". /etc/os-release && echo \"$ID\""),
-                _run_cmd(". /etc/os-release && echo \"$VERSION_ID\""),
-                _run_cmd("uname -s -r -v"),
-                _run_cmd("uname -m"),
-                _run_cmd("uname -p"),
-                _run_cmd("cat /proc/meminfo")
-            ])
+        # information doesn't change while SUT is running
+        if self._info:
+            return self._info.copy()
 
-        memory = "unknown"
-        swap = "unkown"
+        if not await self.is_running:
+            return dict.fromkeys(INFO_KEYS, "unknown")
 
-        if meminfo:
-            mem_m = re.search(r'MemTotal:\s+(?P<memory>\d+\s+kB)', meminfo)
-            if mem_m:
-                memory = mem_m.group('memory')
+        values = ["unknown"] * len(INFO_COMMANDS)
 
-            swap_m = re.search(r'SwapTotal:\s+(?P<swap>\d+\s+kB)', meminfo)
-            if swap_m:
-                swap = swap_m.group('swap')
+        try:
+            ret = await asyncio.wait_for(self.run_command(INFO_SCRIPT), 3)
+            values = _parse_info(ret["stdout"])
+        except asyncio.TimeoutError:
+            pass
+
+        distro, distro_ver, kernel, arch, cpu, meminfo = values
+
+        memory = "unknown"
+        swap = "unknown"
+
+        for line in meminfo.splitlines():
+            key, _, value = line.partition(":")
+            if key == "MemTotal":
+                memory = value.strip()
+            elif key == "SwapTotal":
+                swap = value.strip()
 
         ret = {
             "distro": distro,
@@ -231,46 +268,59 @@ class SUT(Plugin):
             "swap": swap
         }
 
-        return ret
+        # don't keep a result which doesn't contain any information
+        if any(value != "unknown" for value in ret.values()):
+            self._info = ret.copy()
 
-    _tainted_lock = asyncio.Lock()
-    _tainted_status = asyncio.Queue(maxsize=1)
+        return ret
 
-    async def get_tainted_info(self) -> tuple:
+    async def _read_tainted_info(self) -> tuple:
         """
-        Return information about kernel if tainted.
-        :returns: (int, list[str])
+        Read tainted kernel information from SUT.
         """
-        if self._tainted_lock.locked() and self._tainted_status.qsize() > 0:
-            status = await self._tainted_status.get()
-            return status
-
-        async with self._tainted_lock:
-            ret = await self.run_command("cat /proc/sys/kernel/tainted")
-            if ret["returncode"] != 0:
-                raise SUTError("Can't read tainted kernel information")
+        ret = await self.run_command("cat /proc/sys/kernel/tainted")
+        if ret["returncode"] != 0:
+            raise SUTError("Can't read tainted kernel information")
 
-            stdout = ret["stdout"].rstrip()
-
-            tainted_num = len(TAINTED_MSG)
-            code = stdout.rstrip()
+        stdout = ret["stdout"].rstrip()
 
+        try:
+            code = int(stdout)
+        except ValueError:
             # output is likely message in stderr
-            if not code.isdigit():
-                raise SUTError(code)
+            raise SUTError(stdout)
 
-            code = int(code)
-            bits = format(code, f"0{tainted_num}b")[::-1]
+        # a negative code would match all the tainted bits
+        if code < 0:
+            raise SUTError(f"Invalid tainted kernel code: {stdout}")
 
-            messages = []
-            for i in range(0, tainted_num):
-                if bits[i] == "1":
-                    msg = TAINTED_MSG[i]
-                    messages.append(msg)
+        messages = [msg for mask, msg in TAINTED_BITS if code & mask]
 
-            if self._tainted_status.qsize() > 0:
-                await self._tainted_status.get()
+        return code, messages
 
-            await self._tainted_status.put((code, messages))
+    # tainted information which is currently read from SUT
+    _tainted_future = None
 
-            return code, messages
+    async def get_tainted_info(self) -> tuple:
+        """
+        Return information about kernel if tainted.
+        :returns: (int, list[str])
+        """
+        # a read is already in progress, so we wait for its result
+        # instead of sending one more command to SUT
+        if self._tainted_future and not self._tainted_future.done():
+            return await asyncio.shield(self._tainted_future)
+
+        future = libkirk.get_event_loop().create_future()
+        self._tainted_future = future
+
+        try:
+            future.set_result(await self._read_tainted_info())
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        # pylint: disable=broad-except
+        except Exception as err:
+            future.set_exception(err)
+
+        return future.result()
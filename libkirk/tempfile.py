@@ -8,8 +8,17 @@
 import os
 import pwd
 import shutil
-import pathlib
 import tempfile
+import functools
+
+
+@functools.lru_cache(maxsize=1)
+def _current_username() -> str:
+    """
+    Return the name of the current user. The lookup might go through
+    remote user databases, so it's done only once.
+    """
+    return pwd.getpwuid(os.getuid()).pw_name
 
 
 class TempDir:
@@ -45,41 +54,46 @@ class TempDir:
         if not self._root:
             return ""
 
-        name = pwd.getpwuid(os.getuid()).pw_name
+        name = _current_username()
         tmpbase = os.path.join(self._root, f"{self.FOLDER_PREFIX}{name}")
 
         os.makedirs(tmpbase, exist_ok=True)
 
-        # delete the first max_rotate items
-        sorted_paths = sorted(
-            pathlib.Path(tmpbase).iterdir(),
-            key=os.path.getmtime)
+        # directory entries cache the stat() result, so we don't need
+        # to stat each folder once again when sorting them
+        with os.scandir(tmpbase) as entries:
+            # don't consider latest symlink and its temporary copy
+            folders = [
+                entry for entry in entries
+                if not entry.name.startswith(self.SYMLINK_NAME)
+            ]
 
-        # don't consider latest symlink
-        num_paths = len(sorted_paths) - 1
+        folders.sort(key=lambda entry: entry.stat().st_mtime)
+
+        # delete the first max_rotate items
+        num_paths = len(folders)
 
         if num_paths >= self._max_rotate:
             max_items = num_paths - self._max_rotate + 1
-            paths = sorted_paths[:max_items]
 
-            for path in paths:
-                if path.name == self.SYMLINK_NAME:
-                    continue
-
-                shutil.rmtree(str(path.resolve()))
+            for entry in folders[:max_items]:
+                shutil.rmtree(entry.path)
 
         # create a new folder
         folder = tempfile.mkdtemp(dir=tmpbase)
 
-        # create symlink to the latest temporary directory
+        # create symlink to the latest temporary directory. The new symlink
+        # replaces the old one atomically, so latest is always available
         latest = os.path.join(tmpbase, self.SYMLINK_NAME)
-        if os.path.islink(latest):
-            os.remove(latest)
+        tmp_link = f"{latest}.new"
+
+        try:
+            os.remove(tmp_link)
+        except FileNotFoundError:
+            pass
 
-        os.symlink(
-            folder,
-            os.path.join(tmpbase, self.SYMLINK_NAME),
-            target_is_directory=True)
+        os.symlink(folder, tmp_link, target_is_directory=True)
+        os.replace(tmp_link, latest)
 
         return folder
 
@@ -113,7 +127,7 @@ class TempDir:
         dpath = os.path.join(self._folder, path)
         os.mkdir(dpath)
 
-    def mkfile(self, path: str, content: bytes) -> None:
+    def mkfile(self, path: str, content: str) -> None:
         """
         Create a file inside temporary directory.
         :param path: path of the file
@@ -125,5 +139,5 @@ class TempDir:
             return
 
         fpath = os.path.join(self._folder, path)
-        with open(fpath, "w+", encoding="utf-8") as mypath:
-            mypath.write(content)
+        with open(fpath, "wb") as mypath:
+            mypath.write(content.encode("utf-8"))
@@ -1,23 +1,43 @@
 """
 Generic stuff for pytest.
 """
-import libkirk
+import asyncio
+import inspect
+import importlib
 import pytest
 from libkirk.results import TestResults
 from libkirk.sut import SUT
+from libkirk.host import HostSUT
 from libkirk.framework import Framework
 from libkirk.data import Suite
 from libkirk.data import Test
 
 
 @pytest.fixture(scope="session")
-def event_loop():
+def event_loop_policy():
+    """
+    Event loop policy used to create the session event loop. It provides
+    uvloop when it's available, like the kirk command does.
+    """
+    if importlib.util.find_spec("uvloop"):
+        return importlib.import_module("uvloop").EventLoopPolicy()
+
+    return asyncio.get_event_loop_policy()
+
+
+@pytest.fixture(scope="session")
+def event_loop(event_loop_policy):
     """
     Current event loop. Keep it in session scope, otherwise tests which
     will use same coroutines will be associated to different event_loop.
     In this way, pytest-asyncio plugin will work properly.
+
+    This fixture is used by pytest-asyncio < 0.24. Newer versions are
+    using the session loop scope defined in pytest.ini and by the asyncio
+    markers added in pytest_collection_modifyitems(), which create the
+    loop via event_loop_policy.
     """
-    loop = libkirk.get_event_loop()
+    loop = event_loop_policy.new_event_loop()
 
     yield loop
 
@@ -25,6 +45,69 @@ def event_loop():
         loop.close()
 
 
+@pytest.fixture(scope="session")
+async def host_sut():
+    """
+    Host SUT communication object shared by the frameworks tests. They
+    don't stop it, so it's started once for the whole session.
+    """
+    obj = HostSUT()
+    obj.setup()
+
+    await obj.communicate()
+    try:
+        yield obj
+    finally:
+        await obj.stop()
+
+
+def pytest_collection_modifyitems(items):
+    """
+    Run coroutine tests inside the session event loop, like fixtures.
+    pytest-asyncio 0.24 and 0.25 don't support the
+    asyncio_default_test_loop_scope option, so the loop scope is given by
+    the asyncio marker.
+    """
+    for item in items:
+        if inspect.iscoroutinefunction(getattr(item, "obj", None)):
+            item.add_marker(pytest.mark.asyncio(loop_scope="session"))
+
+
+def _assert_result(
+        result: TestResults,
+        *,
+        test: Test,
+        exec_time: float,
+        return_code: int,
+        stdout: str,
+        **counters: dict) -> None:
+    """
+    Check the frameworks read_result() output. Counters which are not
+    given are expected to be zero. All values are compared at once, so
+    failures show the whole diff.
+    """
+    expected = dict.fromkeys(
+        ("passed", "failed", "broken", "skipped", "warnings"), 0)
+    expected.update(counters)
+    expected.update(
+        test=test,
+        exec_time=exec_time,
+        return_code=return_code,
+        stdout=stdout)
+
+    assert {key: getattr(result, key) for key in expected} == expected
+
+
+# results counted by DummyFramework for each return code. Any other
+# return code is counted as failure
+RETCODE_RESULTS = {
+    0: "passed",
+    4: "warnings",
+    32: "skipped",
+    -1: "broken",
+}
+
+
 class DummyFramework(Framework):
     """
     A generic framework created for testing.
@@ -32,11 +115,53 @@ class DummyFramework(Framework):
 
     def __init__(self) -> None:
         self._root = None
+        self._env = None
+        self._suites = {}
+
+    def _test(self, name: str, cmd: str, args: list, parallel: bool) -> Test:
+        """
+        Create a test running inside the framework root and environment.
+        """
+        return Test(
+            name=name,
+            cwd=self._root,
+            env=self._env,
+            cmd=cmd,
+            args=args,
+            parallelizable=parallel)
 
     def setup(self, **kwargs: dict) -> None:
         self._root = kwargs.get("root", "/")
         self._env = kwargs.get("env", None)
 
+        # tests can't be modified, so they are created once for each
+        # setup() call, which can change their root and env
+        self._suites = {
+            "suite01": [
+                self._test("test01", "echo", ["-n", "ciao0"], False),
+                self._test("test02", "echo", ["-n", "ciao0"], False),
+            ],
+            "suite02": [
+                self._test("test01", "echo", ["-n", "ciao0"], False),
+                self._test(
+                    "test02",
+                    "sleep",
+                    ["0.2", "&&", "echo", "-n", "ciao1"],
+                    True),
+            ],
+            "sleep": [
+                self._test("test01", "sleep", ["2"], False),
+                self._test("test02", "sleep", ["2"], False),
+            ],
+            "environ": [
+                self._test("test01", "echo", ["-n", "$hello"], False),
+            ],
+            "kernel_panic": [
+                self._test("test01", "echo", ["Kernel", "panic"], False),
+                self._test("test01", "sleep", ["0.2"], False),
+            ],
+        }
+
     @property
     def name(self) -> str:
         return "dummy"
@@ -46,96 +171,18 @@ class DummyFramework(Framework):
         return {}
 
     async def get_suites(self, sut: SUT) -> list:
-        return ["suite01", "suite02", "sleep", "environ", "kernel_panic"]
+        return list(self._suites)
 
     async def find_command(self, sut: SUT, command: str) -> Test:
         return Test(name=command, cmd=command)
 
     async def find_suite(self, sut: SUT, name: str) -> Suite:
-        if name in "suite01":
-            test0 = Test(
-                name="test01",
-                cwd=self._root,
-                env=self._env,
-                cmd="echo",
-                args=["-n", "ciao0"],
-                parallelizable=False)
-
-            test1 = Test(
-                name="test02",
-                cwd=self._root,
-                env=self._env,
-                cmd="echo",
-                args=["-n", "ciao0"],
-                parallelizable=False)
-
-            return Suite(name, [test0, test1])
-        if name == "suite02":
-            test0 = Test(
-                name="test01",
-                cwd=self._root,
-                env=self._env,
-                cmd="echo",
-                args=["-n", "ciao0"],
-                parallelizable=False)
-
-            test1 = Test(
-                name="test02",
-                cwd=self._root,
-                env=self._env,
-                cmd="sleep",
-                args=["0.2", "&&", "echo", "-n", "ciao1"],
-                parallelizable=True)
-
-            return Suite(name, [test0, test1])
-        elif name == "sleep":
-            test0 = Test(
-                name="test01",
-                cwd=self._root,
-                env=self._env,
-                cmd="sleep",
-                args=["2"],
-                parallelizable=False)
-
-            test1 = Test(
-                name="test02",
-                cwd=self._root,
-                env=self._env,
-                cmd="sleep",
-                args=["2"],
-                parallelizable=False)
-
-            return Suite(name, [test0, test1])
-        elif name == "environ":
-            test0 = Test(
-                name="test01",
-                cwd=self._root,
-                env=self._env,
-                cmd="echo",
-                args=["-n", "$hello"],
-                parallelizable=False)
-
-            return Suite(name, [test0])
-        elif name == "kernel_panic":
-            test0 = Test(
-                name="test01",
-                cwd=self._root,
-                env=self._env,
-                cmd="echo",
-                args=["Kernel", "panic"],
-                parallelizable=False)
-
-            test1 = Test(
-                name="test01",
-                cwd=self._root,
-                env=self._env,
-                cmd="sleep",
-                args=["0.2"],
-                parallelizable=False)
-
-            return Suite(name, [test0, test1])
-
-        return None
+        tests = self._suites.get(name)
+        if tests is None:
+            return None
+
+        # session might remove skipped tests from the suite
+        return Suite(name, list(tests))
 
     async def read_result(
             self,
@@ -143,36 +190,17 @@ class DummyFramework(Framework):
             stdout: str,
             retcode: int,
             exec_t: float) -> TestResults:
-        passed = 0
-        failed = 0
-        skipped = 0
-        broken = 0
-        skipped = 0
-        warnings = 0
-        error = retcode == -1
-
-        if retcode == 0:
-            passed = 1
-        elif retcode == 4:
-            warnings = 1
-        elif retcode == 32:
-            skipped = 1
-        elif not error:
-            failed = 1
-
-        if error:
-            broken = 1
+        counters = dict.fromkeys(
+            ("passed", "failed", "broken", "skipped", "warnings"), 0)
+
+        counters[RETCODE_RESULTS.get(retcode, "failed")] = 1
 
         result = TestResults(
             test=test,
-            passed=passed,
-            failed=failed,
-            broken=broken,
-            skipped=skipped,
-            warnings=warnings,
             exec_time=exec_t,
             retcode=retcode,
             stdout=stdout,
+            **counters
         )
 
         return result
@@ -181,8 +209,10 @@ class DummyFramework(Framework):
 @pytest.fixture
 def dummy_framework():
     """
-    A fummy framework implementation used for testing.
+    A dummy framework implementation used for testing. Each test gets its
+    own instance, since main.run() calls setup() on it.
     """
     obj = DummyFramework()
     obj.setup(root="/tmp")
-    yield obj
+
+    return obj
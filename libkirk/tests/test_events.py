@@ -84,6 +84,7 @@ async def test_fire():
     """
     times = 100
     called = []
+    done = asyncio.Event()
 
     async def diehard(error, name):
         assert error is not None
@@ -91,17 +92,19 @@ async def test_fire():
 
     async def tofire(param):
         called.append(param)
+        if len(called) == times:
+            done.set()
 
     async def start():
         await libkirk.events.start()
 
     async def run():
-        for i in range(times):
-            await libkirk.events.fire("myevent", i)
-
-        while len(called) < times:
-            await asyncio.sleep(1e-3)
+        await asyncio.gather(*[
+            libkirk.events.fire("myevent", i)
+            for i in range(times)
+        ])
 
+        await done.wait()
         await libkirk.events.stop()
 
     libkirk.events.register("myevent", tofire)
@@ -113,9 +116,6 @@ async def test_fire():
     libkirk.create_task(start())
     await run()
 
-    while len(called) < times:
-        asyncio.sleep(1e-3)
-
     called.sort()
     for i in range(times):
         assert called[i] == i
@@ -4,7 +4,7 @@ Test kselftest implementations.
 import os
 import pytest
 from libkirk.data import Test
-from libkirk.host import HostSUT
+from libkirk.tests.conftest import _assert_result
 from libkirk.kselftests import KselftestFramework
 
 pytestmark = pytest.mark.asyncio
@@ -27,44 +27,37 @@ class TestKselftestsFramework:
     ]
 
     @pytest.fixture
-    async def sut(self):
-        """
-        Host SUT communication object.
-        """
-        obj = HostSUT()
-        obj.setup()
-
-        await obj.communicate()
-        yield obj
-        await obj.stop()
-
-    @pytest.fixture
-    def framework(self, tmpdir):
+    def framework(self, root):
         """
         LTP framework object.
         """
         fw = KselftestFramework()
-        fw.setup(root=str(tmpdir))
+        fw.setup(root=str(root))
 
         yield fw
 
-    @pytest.fixture(autouse=True)
-    def prepare_tmpdir(self, tmpdir):
+    @pytest.fixture(scope="class")
+    def root(self, tmp_path_factory):
         """
-        Prepare the temporary directory adding runtest folder.
+        Prepare the kselftests root folder adding tests. Tests don't modify
+        it, so it's created once for all tests.
         """
+        root = tmp_path_factory.mktemp("kselftests")
+
         for group in self.GROUPS:
-            group_dir = tmpdir.mkdir(group)
+            group_dir = root / group
+            group_dir.mkdir()
 
             if group == "cgroup":
                 for name in self.TESTS:
                     # use a generic script simulating binary build
                     test_binfile = group_dir / name
-                    test_binfile.write(f"#!/bin/sh\n\necho -n {name}\n")
+                    test_binfile.write_text(f"#!/bin/sh\n\necho -n {name}\n")
 
-                    # source code of the test we are simulating
+                    # source code of the test we are simulating. It's listed
+                    # together with binaries, so it checks they are filtered
                     test_file = group_dir / f"{name}.c"
-                    test_file.write("int main() { return 0; }\n\n")
+                    test_file.write_text("int main() { return 0; }\n\n")
 
             if group == "bpf":
                 test_binfile = group_dir / "test_progs"
@@ -76,37 +69,40 @@ class TestKselftestsFramework:
 
                 test_binfile.chmod(0o700)
 
+        return root
+
     def test_name(self, framework):
         """
         Test that name property is not empty.
         """
         assert framework.name == "kselftests"
 
-    async def test_get_suites(self, framework, sut):
+    async def test_get_suites(self, framework, host_sut):
         """
         Test get_suites method.
         """
-        suites = await framework.get_suites(sut)
+        suites = await framework.get_suites(host_sut)
         assert suites == self.GROUPS
 
-    async def test_find_command(self, framework, sut, tmpdir):
+    async def test_find_command(self, framework, host_sut, root):
         """
         Test find_command method.
         """
-        test = await framework.find_command(sut, "test_progs")
+        test = await framework.find_command(host_sut, "test_progs")
         assert test.name == "test_progs"
         assert test.command == "test_progs"
         assert not test.arguments
         assert not test.parallelizable
-        assert test.env == {"PATH": str(tmpdir / "bpf")}
-        assert test.cwd == str(tmpdir / "bpf")
+        assert test.env == {"PATH": str(root / "bpf")}
+        assert test.cwd == str(root / "bpf")
 
-    async def test_find_suite(self, framework, sut, tmpdir):
+    async def test_find_suite(self, framework, host_sut, root):
         """
         Test find_suite method.
         """
         for group in self.GROUPS:
-            suite = await framework.find_suite(sut, group)
+            suite = await framework.find_suite(host_sut, group)
+            group_dir = str(root / group)
 
             assert len(suite.tests) == len(self.TESTS)
 
@@ -114,77 +110,43 @@ class TestKselftestsFramework:
                 test = suite.tests[i]
 
                 assert not test.env
-                assert test.cwd == str(tmpdir / group)
+                assert test.cwd == group_dir
                 assert not test.parallelizable
 
-                if suite == "cgroup":
+                if group == "cgroup":
                     assert os.path.basename(test.command) in self.TESTS
                     assert not test.arguments
-                elif suite == "bpf":
+                elif group == "bpf":
                     assert test.command == "./test_progs"
                     assert test.arguments[0] == "-t"
                     assert test.arguments[1] in self.TESTS
 
-    async def test_read_result_passed(self, framework):
-        """
-        Test read_result method when test passes.
-        """
-        test = Test(name="test", cmd="echo", args="ciao")
-        result = await framework.read_result(test, 'ciao\n', 0, 0.1)
-        assert result.passed == 1
-        assert result.failed == 0
-        assert result.broken == 0
-        assert result.skipped == 0
-        assert result.warnings == 0
-        assert result.exec_time == 0.1
-        assert result.test == test
-        assert result.return_code == 0
-        assert result.stdout == "ciao\n"
-
-    async def test_read_result_failure(self, framework):
-        """
-        Test read_result method when test fails.
-        """
-        test = Test(name="test", cmd="echo")
-        result = await framework.read_result(test, '', 1, 0.1)
-        assert result.passed == 0
-        assert result.failed == 1
-        assert result.broken == 0
-        assert result.skipped == 0
-        assert result.warnings == 0
-        assert result.exec_time == 0.1
-        assert result.test == test
-        assert result.return_code == 1
-        assert result.stdout == ""
-
-    async def test_read_result_broken(self, framework):
-        """
-        Test read_result method when test is broken.
-        """
-        test = Test(name="test", cmd="echo")
-        result = await framework.read_result(test, '', -1, 0.1)
-        assert result.passed == 0
-        assert result.failed == 0
-        assert result.broken == 1
-        assert result.skipped == 0
-        assert result.warnings == 0
-        assert result.exec_time == 0.1
-        assert result.test == test
-        assert result.return_code == -1
-        assert result.stdout == ""
-
-    async def test_read_result_skipped(self, framework):
-        """
-        Test read_result method when test has skip.
-        """
-        test = Test(name="test", cmd="echo", args=["skip"])
-        result = await framework.read_result(test, "skip\n", 4, 0.1)
-        assert result.passed == 0
-        assert result.failed == 0
-        assert result.broken == 0
-        assert result.skipped == 1
-        assert result.warnings == 0
-        assert result.exec_time == 0.1
-        assert result.test == test
-        assert result.return_code == 4
-        assert result.stdout == "skip\n"
+    @pytest.mark.parametrize(
+        "args, stdout, retcode, counters",
+        [
+            ("ciao", "ciao\n", 0, {"passed": 1}),
+            ([], "", 1, {"failed": 1}),
+            ([], "", -1, {"broken": 1}),
+            (["skip"], "skip\n", 4, {"skipped": 1}),
+        ],
+        ids=["passed", "failure", "broken", "skipped"])
+    async def test_read_result(
+            self,
+            framework,
+            args,
+            stdout,
+            retcode,
+            counters):
+        """
+        Test read_result method.
+        """
+        test = Test(name="test", cmd="echo", args=args)
+        result = await framework.read_result(test, stdout, retcode, 0.1)
+
+        _assert_result(
+            result,
+            test=test,
+            exec_time=0.1,
+            return_code=retcode,
+            stdout=stdout,
+            **counters)
@@ -5,8 +5,8 @@ import os
 import json
 import pytest
 from libkirk.data import Test
+from libkirk.tests.conftest import _assert_result
 from libkirk.ltp import LTPFramework
-from libkirk.host import HostSUT
 
 pytestmark = pytest.mark.asyncio
 
@@ -19,65 +19,65 @@ class TestLTPFramework:
     SUITES_NUM = 3
 
     @pytest.fixture
-    async def sut(self):
-        """
-        Host SUT communication object.
-        """
-        obj = HostSUT()
-        obj.setup()
-
-        await obj.communicate()
-        yield obj
-        await obj.stop()
-
-    @pytest.fixture
-    def framework(self, tmpdir):
+    def framework(self, root):
         """
         LTP framework object.
         """
         fw = LTPFramework()
-        fw.setup(root=str(tmpdir))
+        fw.setup(root=str(root))
 
         yield fw
 
-    @pytest.fixture(autouse=True)
-    def prepare_tmpdir(self, tmpdir):
+    @pytest.fixture(scope="class")
+    def root(self, tmp_path_factory):
         """
-        Prepare the temporary directory adding runtest folder.
+        Prepare the LTP root folder adding runtest folder. Tests don't modify
+        it, so it's created once for all tests.
         """
-        # create simple testing suites
-        content = ""
-        for i in range(self.TESTS_NUM):
-            content += f"test0{i} echo ciao\n"
+        root = tmp_path_factory.mktemp("ltp")
 
-        testcases = tmpdir.mkdir("testcases").mkdir("bin")
-        runtest = tmpdir.mkdir("runtest")
+        testcases = root / "testcases" / "bin"
+        testcases.mkdir(parents=True)
 
-        for i in range(self.SUITES_NUM):
-            suite = runtest / f"suite{i}"
-            suite.write(content)
+        runtest = root / "runtest"
+        runtest.mkdir()
+
+        metadata = root / "metadata"
+        metadata.mkdir()
+
+        # create simple testing suites
+        content = "".join(
+            f"test0{i} echo ciao\n" for i in range(self.TESTS_NUM))
+
+        files = [
+            (runtest / f"suite{i}", content)
+            for i in range(self.SUITES_NUM)
+        ]
 
         # create a suite that is executing slower than the others
         # and it's parallelizable
-        content = ""
-        for i in range(self.TESTS_NUM, self.TESTS_NUM * 2):
-            content += f"slow_test0{i} sleep 0.05\n"
+        slow_tests = [
+            f"slow_test0{i}"
+            for i in range(self.TESTS_NUM, self.TESTS_NUM * 2)
+        ]
 
-        suite = runtest / f"slow_suite"
-        suite.write(content)
+        files.append((
+            runtest / "slow_suite",
+            "".join(f"{name} sleep 0.05\n" for name in slow_tests)))
 
-        tests = {}
-        for i in range(self.TESTS_NUM, self.TESTS_NUM * 2):
-            name = f"slow_test0{i}"
-            tests[name] = {"max_runtime": "10"}
+        metadata_d = {
+            "tests": {name: {"max_runtime": "10"} for name in slow_tests}
+        }
 
-        metadata_d = {"tests": tests}
-        metadata = tmpdir.mkdir("metadata") / "ltp.json"
-        metadata.write(json.dumps(metadata_d))
+        files.append((metadata / "ltp.json", json.dumps(metadata_d)))
 
         # create shell test
-        test_sh = testcases / "test.sh"
-        test_sh.write("#!/bin/bash\necho $1 $2\n")
+        files.append((testcases / "test.sh", "#!/bin/bash\necho $1 $2\n"))
+
+        for path, data in files:
+            path.write_bytes(data.encode("utf-8"))
+
+        return root
 
     def test_name(self, framework):
         """
@@ -85,136 +85,101 @@ class TestLTPFramework:
         """
         assert framework.name == "ltp"
 
-    async def test_get_suites(self, framework, sut, tmpdir):
+    async def test_get_suites(self, framework, host_sut, root):
         """
         Test get_suites method.
         """
-        suites = await framework.get_suites(sut)
+        suites = await framework.get_suites(host_sut)
         assert "suite0" in suites
         assert "suite1" in suites
         assert "suite2" in suites
         assert "slow_suite" in suites
 
-    async def test_find_command(self, framework, sut, tmpdir):
+    async def test_find_command(self, framework, host_sut, root):
         """
         Test find_command method.
         """
-        test = await framework.find_command(sut, "test.sh ciao bepi")
+        test = await framework.find_command(host_sut, "test.sh ciao bepi")
         assert test.name == "test.sh"
         assert test.command == "test.sh"
         assert test.arguments == ["ciao", "bepi"]
         assert not test.parallelizable
-        assert test.cwd == tmpdir / "testcases" / "bin"
+        assert test.cwd == str(root / "testcases" / "bin")
         assert test.env
 
-    async def test_find_suite(self, framework, sut, tmpdir):
+    async def test_find_suite(self, framework, host_sut, root):
         """
         Test find_suite method.
         """
-        for i in range(self.SUITES_NUM):
-            suite = await framework.find_suite(sut, f"suite{i}")
-            assert len(suite.tests) == self.TESTS_NUM
-
-            for j in range(self.TESTS_NUM):
-                test = suite.tests[j]
-                assert test.name == f"test0{j}"
-                assert test.command == "echo"
-                assert test.arguments == ["ciao"]
-                assert test.cwd == os.path.join(
-                    str(tmpdir),
-                    "testcases",
-                    "bin")
-                assert not test.parallelizable
-                assert "LTPROOT" in test.env
-                assert "TMPDIR" in test.env
-                assert "LTP_COLORIZE_OUTPUT" in test.env
-
-        suite = await framework.find_suite(sut, "slow_suite")
-        assert len(suite.tests) == self.TESTS_NUM
+        testcases = os.path.join(str(root), "testcases", "bin")
 
-        for test in suite.tests:
-            assert test.command == "sleep"
-            assert test.arguments == ["0.05"]
-            assert test.cwd == os.path.join(
-                str(tmpdir),
-                "testcases",
-                "bin")
+        def check_sample(test, command, arguments):
+            # tests of the same suite are created by the same runtest line
+            # format, so their shape is checked only once
+            assert test.command == command
+            assert test.arguments == arguments
+            assert test.cwd == testcases
             assert not test.parallelizable
             assert "LTPROOT" in test.env
             assert "TMPDIR" in test.env
             assert "LTP_COLORIZE_OUTPUT" in test.env
 
-    async def test_find_suite_max_runtime(self, sut, tmpdir):
+        for i in range(self.SUITES_NUM):
+            suite = await framework.find_suite(host_sut, f"suite{i}")
+            assert len(suite.tests) == self.TESTS_NUM
+
+            check_sample(suite.tests[0], "echo", ["ciao"])
+
+            names = [test.name for test in suite.tests]
+            assert names == [f"test0{j}" for j in range(self.TESTS_NUM)]
+
+        suite = await framework.find_suite(host_sut, "slow_suite")
+        assert len(suite.tests) == self.TESTS_NUM
+
+        check_sample(suite.tests[0], "sleep", ["0.05"])
+
+        names = [test.name for test in suite.tests]
+        assert names == [
+            f"slow_test0{j}"
+            for j in range(self.TESTS_NUM, self.TESTS_NUM * 2)
+        ]
+
+    async def test_find_suite_max_runtime(self, host_sut, root):
         """
         Test find_suite method when max_runtime is defined.
         """
         framework = LTPFramework()
-        framework.setup(root=str(tmpdir), max_runtime=5)
+        framework.setup(root=str(root), max_runtime=5)
 
-        suite = await framework.find_suite(sut, "slow_suite")
+        suite = await framework.find_suite(host_sut, "slow_suite")
         assert len(suite.tests) == 0
 
-    async def test_read_result_passed(self, framework):
-        """
-        Test read_result method when test passes.
-        """
-        test = Test(name="test", cmd="echo", args="ciao")
-        result = await framework.read_result(test, 'ciao\n', 0, 0.1)
-        assert result.passed == 1
-        assert result.failed == 0
-        assert result.broken == 0
-        assert result.skipped == 0
-        assert result.warnings == 0
-        assert result.exec_time == 0.1
-        assert result.test == test
-        assert result.return_code == 0
-        assert result.stdout == "ciao\n"
-
-    async def test_read_result_failure(self, framework):
-        """
-        Test read_result method when test fails.
-        """
-        test = Test(name="test", cmd="echo")
-        result = await framework.read_result(test, '', 1, 0.1)
-        assert result.passed == 0
-        assert result.failed == 1
-        assert result.broken == 0
-        assert result.skipped == 0
-        assert result.warnings == 0
-        assert result.exec_time == 0.1
-        assert result.test == test
-        assert result.return_code == 1
-        assert result.stdout == ""
-
-    async def test_read_result_broken(self, framework):
-        """
-        Test read_result method when test is broken.
-        """
-        test = Test(name="test", cmd="echo")
-        result = await framework.read_result(test, '', -1, 0.1)
-        assert result.passed == 0
-        assert result.failed == 0
-        assert result.broken == 1
-        assert result.skipped == 0
-        assert result.warnings == 0
-        assert result.exec_time == 0.1
-        assert result.test == test
-        assert result.return_code == -1
-        assert result.stdout == ""
-
-    async def test_read_result_skipped(self, framework):
-        """
-        Test read_result method when test has skip.
-        """
-        test = Test(name="test", cmd="echo")
-        result = await framework.read_result(
-            test, "mydata", 32, 0.1)
-        assert result.passed == 0
-        assert result.failed == 0
-        assert result.broken == 0
-        assert result.skipped == 1
-        assert result.warnings == 0
-        assert result.exec_time == 0.1
-        assert result.test == test
-        assert result.return_code == 32
-        assert result.stdout == "mydata"
+    @pytest.mark.parametrize(
+        "args, stdout, retcode, counters",
+        [
+            ("ciao", "ciao\n", 0, {"passed": 1}),
+            ([], "", 1, {"failed": 1}),
+            ([], "", -1, {"broken": 1}),
+            ([], "mydata", 32, {"skipped": 1}),
+        ],
+        ids=["passed", "failure", "broken", "skipped"])
+    async def test_read_result(
+            self,
+            framework,
+            args,
+            stdout,
+            retcode,
+            counters):
+        """
+        Test read_result method.
+        """
+        test = Test(name="test", cmd="echo", args=args)
+        result = await framework.read_result(test, stdout, retcode, 0.1)
+
+        _assert_result(
+            result,
+            test=test,
+            exec_time=0.1,
+            return_code=retcode,
+            stdout=stdout,
+            **counters)
@@ -26,11 +26,13 @@ class TestLTX:
     Test LTX implementation.
     """
 
-    @pytest.fixture
-    async def ltx(self, tmpdir):
+    @pytest.fixture(scope="class")
+    async def ltx(self, tmp_path_factory):
         """
-        LTX handler.
+        LTX handler. Tests don't stop it, so the same LTX process is used
+        by all tests of the class.
         """
+        tmpdir = tmp_path_factory.mktemp("ltx")
         stdin_path = str(tmpdir / 'transport.in')
         stdout_path = str(tmpdir / 'transport.out')
 
@@ -1,53 +1,56 @@
 """
 Unittests for framework module.
 """
+import textwrap
+import pytest
 import libkirk
 import libkirk.plugin
 from libkirk.sut import SUT
 from libkirk.framework import Framework
 
 
-def test_sut(tmpdir):
+@pytest.fixture(scope="session")
+def plugins_dir(tmp_path_factory):
+    """
+    Folder containing SUT and Framework implementations. Files are written
+    once and shared by the discover tests, which only read them.
+    """
+    folder = tmp_path_factory.mktemp("plugins")
+
+    plugins = (
+        ("sut", "libkirk.sut", "SUT", "mysut"),
+        ("framework", "libkirk.framework", "Framework", "fw"),
+    )
+
+    for prefix, module, base, name in plugins:
+        for index, ext in enumerate(["A.py", "B.py", "C.txt"]):
+            code = textwrap.dedent(f"""\
+                from {module} import {base}
+
+                class {base}{index}({base}):
+                    @property
+                    def name(self) -> str:
+                        return '{name}{index}'
+                """)
+
+            (folder / f"{prefix}{ext}").write_text(code, encoding="utf-8")
+
+    return str(folder)
+
+
+def test_sut(plugins_dir):
     """
     Test if SUT implementations are correctly loaded.
     """
-    suts = []
-    suts.append(tmpdir / "sutA.py")
-    suts.append(tmpdir / "sutB.py")
-    suts.append(tmpdir / "sutC.txt")
-
-    for index in range(0, len(suts)):
-        suts[index].write(
-            "from libkirk.sut import SUT\n\n"
-            f"class SUT{index}(SUT):\n"
-            "    @property\n"
-            "    def name(self) -> str:\n"
-            f"        return 'mysut{index}'\n"
-        )
-
-    suts = libkirk.plugin.discover(SUT, str(tmpdir))
+    suts = libkirk.plugin.discover(SUT, plugins_dir)
 
     assert len(suts) == 2
 
 
-def test_framework(tmpdir):
+def test_framework(plugins_dir):
     """
     Test if Framework implementations are correctly loaded.
     """
-    suts = []
-    suts.append(tmpdir / "frameworkA.py")
-    suts.append(tmpdir / "frameworkB.py")
-    suts.append(tmpdir / "frameworkC.txt")
-
-    for index in range(0, len(suts)):
-        suts[index].write(
-            "from libkirk.framework import Framework\n\n"
-            f"class Framework{index}(Framework):\n"
-            "    @property\n"
-            "    def name(self) -> str:\n"
-            f"        return 'fw{index}'\n"
-        )
-
-    suts = libkirk.plugin.discover(Framework, str(tmpdir))
+    frameworks = libkirk.plugin.discover(Framework, plugins_dir)
 
-    assert len(suts) == 2
+    assert len(frameworks) == 2
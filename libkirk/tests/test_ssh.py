@@ -6,27 +6,30 @@ import subprocess
 import asyncio
 import pytest
 from libkirk.sut import IOBuffer
+from libkirk.sut import SUTError
 from libkirk.sut import KernelPanicError
 from libkirk.ssh import SSHSUT
 from libkirk.tests.test_sut import _TestSUT
 from libkirk.tests.test_session import _TestSession
 
-pytestmark = [pytest.mark.asyncio, pytest.mark.ssh]
-
 TEST_SSH_USERNAME = os.environ.get("TEST_SSH_USERNAME", None)
 TEST_SSH_PASSWORD = os.environ.get("TEST_SSH_PASSWORD", None)
 TEST_SSH_KEY_FILE = os.environ.get("TEST_SSH_KEY_FILE", None)
 
+# marks of the tests which need a running SSH server. Setup tests are
+# synchronous, so asyncio mark is not applied to the whole module
+SSH_MARKS = [pytest.mark.asyncio, pytest.mark.ssh]
+
 if not TEST_SSH_USERNAME:
-    pytestmark.append(pytest.mark.skip(
+    SSH_MARKS.append(pytest.mark.skip(
         reason="TEST_SSH_USERNAME not defined"))
 
 if not TEST_SSH_PASSWORD:
-    pytestmark.append(pytest.mark.skip(
+    SSH_MARKS.append(pytest.mark.skip(
         reason="TEST_SSH_PASSWORD not defined"))
 
 if not TEST_SSH_KEY_FILE:
-    pytestmark.append(pytest.mark.skip(
+    SSH_MARKS.append(pytest.mark.skip(
         reason="TEST_SSH_KEY_FILE not defined"))
 
 
@@ -52,10 +55,51 @@ async def sut(config):
         await sut.stop()
 
 
+class TestSSHSUTSetup:
+    """
+    Test SSHSUT configuration, which doesn't need any SSH server.
+    """
+
+    @pytest.mark.parametrize("port", [0, 70000, "ciao"])
+    def test_port_error(self, port):
+        """
+        Test port option with values out of range.
+        """
+        with pytest.raises(SUTError):
+            SSHSUT().setup(port=port)
+
+    @pytest.mark.parametrize("keepalive", ["-1", "ciao"])
+    def test_keepalive_interval_error(self, keepalive):
+        """
+        Test keepalive_interval option with wrong values.
+        """
+        with pytest.raises(SUTError):
+            SSHSUT().setup(keepalive_interval=keepalive)
+
+    @pytest.mark.parametrize("compression", ["ciao", "1.0"])
+    def test_compression_error(self, compression):
+        """
+        Test compression option with wrong values.
+        """
+        with pytest.raises(SUTError):
+            SSHSUT().setup(compression=compression)
+
+    def test_create_command_env(self):
+        """
+        Test that commands can be created with non-string env values.
+        """
+        sut = SSHSUT()
+        sut.setup()
+
+        cmd = sut._create_command("ls", "/tmp", {"list": [1, 2], "num": 1})
+        assert cmd == "cd /tmp && export list='[1, 2]' num=1 && ls"
+
+
 class _TestSSHSUT(_TestSUT):
     """
     Test SSHSUT implementation using username/password.
     """
+    pytestmark = SSH_MARKS
 
     async def test_reset_cmd(self, config):
         """
@@ -185,6 +229,7 @@ class TestSessionSSHPassword(_TestSession):
     """
     Test Session implementation using SSH SUT in password mode.
     """
+    pytestmark = SSH_MARKS
 
     @pytest.fixture
     def config(self, config_password):
@@ -195,6 +240,7 @@ class TestSessionSSHKeyfile(_TestSession):
     """
     Test Session implementation using SSH SUT in keyfile mode.
     """
+    pytestmark = SSH_MARKS
 
     @pytest.fixture
     def config(self, config_keyfile):
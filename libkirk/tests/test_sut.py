@@ -7,25 +7,38 @@ import asyncio
 import logging
 import pytest
 import libkirk
+import libkirk.sut
 from libkirk.sut import IOBuffer
 from libkirk.sut import SUTError
 
 
-pytestmark = pytest.mark.asyncio
-
-
 class Printer(IOBuffer):
     """
     stdout printer.
     """
 
-    def __init__(self) -> None:
-        self._logger = logging.getLogger("test.host")
+    _logger = logging.getLogger("test.host")
 
     async def write(self, data: str) -> None:
         print(data, end="")
 
 
+# Printer doesn't have any state, so the same object is used everywhere
+PRINTER = Printer()
+
+
+class StartBuffer(IOBuffer):
+    """
+    stdout buffer which signals when command started to write on it.
+    """
+
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+
+    async def write(self, data: str) -> None:
+        self.started.set()
+
+
 @pytest.fixture
 def sut():
     """
@@ -34,13 +47,52 @@ def sut():
     raise NotImplementedError()
 
 
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_parse_info(newline):
+    """
+    Test SUT information parsing, also when lines terminate with CRLF.
+    """
+    outputs = [
+        ("opensuse\n", 0),
+        ("", 1),
+        ("Linux 6.1.0\n", 0),
+        ("x86_64\n", 0),
+        ("unknown\n", 0),
+        ("MemTotal: 1000 kB\nSwapTotal: 10 kB\n", 0),
+    ]
+
+    stdout = "".join(
+        f"{output}\n{libkirk.sut.INFO_SEP}{retcode}\n"
+        for output, retcode in outputs)
+
+    stdout = stdout.replace("\n", newline)
+
+    values = libkirk.sut._parse_info(stdout)
+
+    assert values == [
+        "opensuse",
+        "unknown",
+        "Linux 6.1.0",
+        "x86_64",
+        "unknown",
+        f"MemTotal: 1000 kB{newline}SwapTotal: 10 kB",
+    ]
+
+
 class _TestSUT:
     """
     Generic tests for SUT implementation.
     """
+    # test_parse_info is synchronous, so asyncio mark is not applied to the
+    # whole module
+    pytestmark = pytest.mark.asyncio
 
     _logger = logging.getLogger("test.asyncsut")
 
+    # number of commands running in parallel. It's bound, so hosts with
+    # many CPUs don't flood the SUT with commands
+    PARALLEL_COUNT = min(os.cpu_count() or 1, 8)
+
     def test_config_help(self, sut):
         """
         Test if config_help has the right type.
@@ -58,7 +110,7 @@ class _TestSUT:
         """
         Test ping method.
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
         ping_t = await sut.ping()
         assert ping_t > 0
 
@@ -66,7 +118,7 @@ class _TestSUT:
         """
         Test get_info method.
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
         info = await sut.get_info()
 
         assert info["distro"]
@@ -74,11 +126,19 @@ class _TestSUT:
         assert info["kernel"]
         assert info["arch"]
 
+    async def test_get_info_no_running(self, sut):
+        """
+        Test get_info method with no running sut.
+        """
+        info = await sut.get_info()
+
+        assert all(value == "unknown" for value in info.values())
+
     async def test_get_tainted_info(self, sut):
         """
         Test get_tainted_info.
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
         code, messages = await sut.get_tainted_info()
 
         assert code >= 0
@@ -88,17 +148,17 @@ class _TestSUT:
         """
         Test communicate method.
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
         with pytest.raises(SUTError):
-            await sut.communicate(iobuffer=Printer())
+            await sut.communicate(iobuffer=PRINTER)
 
     async def test_ensure_communicate(self, sut):
         """
         Test ensure_communicate method.
         """
-        await sut.ensure_communicate(iobuffer=Printer())
+        await sut.ensure_communicate(iobuffer=PRINTER)
         with pytest.raises(SUTError):
-            await sut.ensure_communicate(iobuffer=Printer(), retries=1)
+            await sut.ensure_communicate(iobuffer=PRINTER, retries=1)
 
     @pytest.fixture
     def sut_stop_sleep(self, request):
@@ -116,10 +176,10 @@ class _TestSUT:
         """
         async def stop():
             await asyncio.sleep(sut_stop_sleep)
-            await sut.stop(iobuffer=Printer())
+            await sut.stop(iobuffer=PRINTER)
 
         await asyncio.gather(*[
-            sut.communicate(iobuffer=Printer()),
+            sut.communicate(iobuffer=PRINTER),
             stop()
         ], return_exceptions=True)
 
@@ -127,7 +187,7 @@ class _TestSUT:
         """
         Execute run_command once.
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
         res = await sut.run_command("echo 0")
 
         assert res["returncode"] == 0
@@ -138,14 +198,15 @@ class _TestSUT:
         """
         Execute run_command once, then call stop().
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
+        buffer = StartBuffer()
 
         async def stop():
-            await asyncio.sleep(0.2)
-            await sut.stop(iobuffer=Printer())
+            await buffer.started.wait()
+            await sut.stop(iobuffer=PRINTER)
 
         async def test():
-            res = await sut.run_command("sleep 2")
+            res = await sut.run_command("echo start; sleep 2", iobuffer=buffer)
 
             assert res["returncode"] != 0
             assert 0 < res["exec_time"] < 2
@@ -162,9 +223,9 @@ class _TestSUT:
         if not sut.parallel_execution:
             pytest.skip(reason="Parallel execution is not supported")
 
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
 
-        exec_count = os.cpu_count()
+        exec_count = self.PARALLEL_COUNT
         coros = [sut.run_command(f"echo {i}")
                  for i in range(exec_count)]
 
@@ -182,15 +243,16 @@ class _TestSUT:
         if not sut.parallel_execution:
             pytest.skip(reason="Parallel execution is not supported")
 
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
+        buffer = StartBuffer()
 
         async def stop():
-            await asyncio.sleep(0.2)
-            await sut.stop(iobuffer=Printer())
+            await buffer.started.wait()
+            await sut.stop(iobuffer=PRINTER)
 
         async def test():
-            exec_count = os.cpu_count()
-            coros = [sut.run_command("sleep 2")
+            exec_count = self.PARALLEL_COUNT
+            coros = [sut.run_command("echo start; sleep 2", iobuffer=buffer)
                      for i in range(exec_count)]
             results = await asyncio.gather(*coros, return_exceptions=True)
 
@@ -211,7 +273,7 @@ class _TestSUT:
         """
         Test fetch_file method with bad arguments.
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
 
         with pytest.raises(ValueError):
             await sut.fetch_file(None)
@@ -223,12 +285,14 @@ class _TestSUT:
         """
         Test fetch_file method.
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
+
+        # create all files with a single command
+        await sut.run_command(
+            "for i in 0 1 2 3 4; do echo -n 'mytests' > /tmp/myfile$i; done")
 
         for i in range(0, 5):
-            myfile = f"/tmp/myfile{i}"
-            await sut.run_command(f"echo -n 'mytests' > {myfile}")
-            data = await sut.fetch_file(myfile)
+            data = await sut.fetch_file(f"/tmp/myfile{i}")
 
             assert data == b"mytests"
 
@@ -237,15 +301,18 @@ class _TestSUT:
         Test stop method when running fetch_file.
         """
         target = "/tmp/target_file"
-        await sut.communicate(iobuffer=Printer())
+        started = asyncio.Event()
+        await sut.communicate(iobuffer=PRINTER)
 
         async def fetch():
-            await sut.run_command(f"truncate -s {1024*1024*1024} {target}"),
+            await sut.run_command(f"truncate -s {64*1024*1024} {target}")
+            started.set()
             await sut.fetch_file(target)
 
         async def stop():
-            await asyncio.sleep(2)
-            await sut.stop(iobuffer=Printer())
+            await started.wait()
+            await asyncio.sleep(0.05)
+            await sut.stop(iobuffer=PRINTER)
 
         libkirk.create_task(fetch())
 
@@ -255,12 +322,12 @@ class _TestSUT:
         """
         Test CWD constructor argument.
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
 
         ret = await sut.run_command(
             "echo -n $PWD",
             cwd="/tmp",
-            iobuffer=Printer())
+            iobuffer=PRINTER)
 
         assert ret["returncode"] == 0
         assert ret["stdout"].strip() == "/tmp"
@@ -269,12 +336,12 @@ class _TestSUT:
         """
         Test ENV constructor argument.
         """
-        await sut.communicate(iobuffer=Printer())
+        await sut.communicate(iobuffer=PRINTER)
 
         ret = await sut.run_command(
             "echo -n $HELLO",
             env=dict(HELLO="ciao"),
-            iobuffer=Printer())
+            iobuffer=PRINTER)
 
         assert ret["returncode"] == 0
         assert ret["stdout"].strip() == "ciao"